@@ -3,18 +3,28 @@
 Docker Container Inspector API
 FastAPI service to inspect Docker containers across multiple hosts
 """
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Path, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
-import subprocess
-import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, List
+from cachetools import TLRUCache, TTLCache
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import asyncssh
+import docker
+import functools
+import shlex
+import time
+import orjson
 import os
+import signal
 
 app = FastAPI(
     title="Docker Container Inspector API",
     description="API to inspect Docker containers across multiple hosts",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for Grafana
@@ -31,9 +41,74 @@ DOCKER_HOSTS = os.getenv("DOCKER_HOSTS", "localhost").split(",")
 DOCKER_HOSTS = [host.strip() for host in DOCKER_HOSTS]  # Remove any whitespace
 LOCAL_HOST = os.getenv("LOCAL_HOST", "false").strip().lower()
 
+# Only hosts from DOCKER_HOSTS may be targeted by per-container requests
+VALID_HOSTS = frozenset(DOCKER_HOSTS)
+
+# Valid Docker container names (or IDs) - anything else is rejected before it
+# can end up in a command line
+CONTAINER_NAME_PATTERN = r"^[A-Za-z0-9][A-Za-z0-9_.-]+$"
+
 # Determine if we have a local host that can use docker socket
 USE_LOCAL_SOCKET = LOCAL_HOST != "false" and os.path.exists("/var/run/docker.sock")
 
+# How long (seconds) container listings and inspect results are cached
+CACHE_TTL = int(os.getenv("CACHE_TTL", "5"))
+
+# Whether to follow docker events on each host to invalidate cached results,
+# and how long (seconds) results are cached for while a host is being watched
+WATCH_EVENTS = os.getenv("WATCH_EVENTS", "true").strip().lower() != "false"
+EVENTS_CACHE_TTL = int(os.getenv("EVENTS_CACHE_TTL", "300"))
+
+# How far back (seconds) to replay events when (re)subscribing to a host
+EVENTS_REPLAY_MARGIN = 30
+
+# Container events that change what the cached endpoints would return
+INVALIDATING_EVENTS = ("create", "start", "restart", "stop", "die", "kill", "destroy",
+                       "rename", "update", "pause", "unpause", "health_status")
+
+# How long (seconds) a container lookup that came back 404 is remembered
+NOT_FOUND_CACHE_TTL = int(os.getenv("NOT_FOUND_CACHE_TTL", "3"))
+
+# docker CLI errors meaning the container really doesn't exist, as opposed to
+# SSH failures, timeouts or bad arguments
+MISSING_CONTAINER_ERRORS = (b"No such container", b"No such object")
+
+# How long (seconds) the container listing waits for each host before leaving it out
+HOST_TIMEOUT = float(os.getenv("HOST_TIMEOUT", "3"))
+
+# How often (seconds) to probe persistent SSH connections, and how many
+# unanswered probes mark one as dead, so half-open connections are noticed
+SSH_KEEPALIVE_INTERVAL = 15
+SSH_KEEPALIVE_COUNT_MAX = 3
+
+# Delay (seconds) before retrying a host's dropped SSH connection or API
+# client, doubled after each failed attempt up to the maximum
+RECONNECT_DELAY = 5
+RECONNECT_MAX_DELAY = 300
+
+# Size of the chunks container logs are streamed to clients in
+LOG_CHUNK_SIZE = 64 * 1024
+
+# Thread pool for the blocking Docker Engine API client calls. Every request
+# that goes through the API holds a thread for its whole round-trip (and a
+# listing left behind by HOST_TIMEOUT keeps holding it), so this is sized for
+# concurrent requests rather than for the number of hosts
+API_EXECUTOR = ThreadPoolExecutor(max_workers=32)
+
+# Fixed ssh client arguments. BatchMode fails fast instead of hanging on a
+# password prompt, -T skips PTY allocation, and the Control* options reuse one
+# multiplexed connection per host instead of a fresh TCP connect + key
+# exchange + auth on every command
+SSH_PREFIX = (
+    "ssh", "-T",
+    "-o", "StrictHostKeyChecking=no",
+    "-o", "ConnectTimeout=5",
+    "-o", "BatchMode=yes",
+    "-o", "ControlMaster=auto",
+    "-o", "ControlPath=/tmp/cia-%C",
+    "-o", "ControlPersist=10m",
+)
+
 
 class ContainerInfo(BaseModel):
     name: str
@@ -45,45 +120,459 @@ class ContainerInfo(BaseModel):
 
 class ContainerList(BaseModel):
     containers: List[ContainerInfo]
+    partial_hosts: List[str] = []  # Hosts that failed or timed out and are missing from containers
+
+
+# Persistent SSH connections, opened at startup and keyed by host
+CONNECTIONS: dict[str, asyncssh.SSHClientConnection] = {}
+
+# Docker Engine API clients for hosts that support them, keyed by host
+CLIENTS: dict[str, docker.DockerClient] = {}
+
+# Pending reconnects per host: when the next attempt is due (time.monotonic()),
+# the current backoff delay and the attempt in progress, if any
+RECONNECT_AT: dict[str, float] = {}
+RECONNECT_DELAYS: dict[str, float] = {}
+RECONNECTS: dict[str, asyncio.Task] = {}
+
+# Hosts whose docker events are currently being followed
+WATCHED_HOSTS: set[str] = set()
+EVENT_WATCHERS: dict[str, asyncio.Task] = {}
+
+
+# Cached endpoints whose results can change without a container event (the
+# compose file is read from disk), so they always expire after CACHE_TTL
+UNWATCHED_ENDPOINTS = frozenset({"compose"})
+
+
+def cache_expiry(key: tuple, value: Any, now: float) -> float:
+    """Cache results for watched hosts until an event invalidates them, others for CACHE_TTL"""
+    if key[0] in WATCHED_HOSTS and key[2] not in UNWATCHED_ENDPOINTS:
+        return now + EVENTS_CACHE_TTL
+    return now + CACHE_TTL
+
+
+# Cache of SSH-backed results, keyed by (host, container_name, endpoint)
+RESPONSE_CACHE: TLRUCache = TLRUCache(maxsize=1024, ttu=cache_expiry)
+
+# Per-key locks for in-flight loads, with the number of requests using each so
+# a lock can be dropped once nobody holds or waits on it
+CACHE_LOCKS: dict[tuple, asyncio.Lock] = {}
+CACHE_LOCK_USERS: dict[tuple, int] = {}
+
+# Bumped on every invalidation of a host, so loads that were already running
+# when a container changed don't cache what they read before the change
+CACHE_GENERATIONS: dict[str, int] = {}
 
+# Recent 404s for containers that don't exist, keyed by (host, container_name)
+NOT_FOUND_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=NOT_FOUND_CACHE_TTL)
 
-def run_ssh_command(host: str, command: str) -> tuple[str, str, int]:
-    """Execute command via SSH on remote host, or locally via docker socket if it's the local host"""
+# Host listings still running after list_containers stopped waiting for them
+PENDING_FETCHES: set[asyncio.Task] = set()
+
+
+async def cached_fetch(key: tuple, loader: Callable[[], Awaitable[Any]], nocache: bool = False) -> Any:
+    """Return the cached result for key, calling loader on a miss.
+    
+    Concurrent misses for the same key wait on a single loader call instead of
+    each running their own SSH command. Exceptions are not cached, and neither
+    are results the host was invalidated under while they were loading.
+    """
+    if not nocache:
+        value = RESPONSE_CACHE.get(key)
+        if value is not None:
+            return value
+    
+    lock = CACHE_LOCKS.get(key)
+    if lock is None:
+        lock = CACHE_LOCKS[key] = asyncio.Lock()
+    CACHE_LOCK_USERS[key] = CACHE_LOCK_USERS.get(key, 0) + 1
+    
+    try:
+        async with lock:
+            if not nocache:
+                value = RESPONSE_CACHE.get(key)
+                if value is not None:
+                    return value
+            
+            generation = CACHE_GENERATIONS.get(key[0], 0)
+            value = await loader()
+            if CACHE_GENERATIONS.get(key[0], 0) == generation:
+                RESPONSE_CACHE[key] = value
+            return value
+    finally:
+        CACHE_LOCK_USERS[key] -= 1
+        if not CACHE_LOCK_USERS[key]:
+            del CACHE_LOCK_USERS[key]
+            del CACHE_LOCKS[key]
+
+
+def kill_process_group(process: asyncio.subprocess.Process) -> None:
+    """Kill a subprocess started in its own session, along with anything it spawned (e.g. a sh -c pipeline)"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def run_subprocess(cmd: list[str]) -> tuple[bytes, bytes, int]:
+    """Run a command as a local subprocess and capture its raw output"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True
+        )
+    except Exception as e:
+        return b"", str(e).encode(), 1
     
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        return stdout, stderr, process.returncode
+    except asyncio.TimeoutError:
+        return b"", b"Command timed out", 1
+    finally:
+        # Don't leave the process behind on timeout or if the request is cancelled
+        if process.returncode is None:
+            kill_process_group(process)
+            await process.wait()
+
+
+def drop_connection(host: str, conn: asyncssh.SSHClientConnection) -> None:
+    """Close a host's persistent connection and forget it, so a reconnect can replace it"""
+    if CONNECTIONS.get(host) is conn:
+        del CONNECTIONS[host]
+    conn.close()
+
+
+def uses_local_socket(host: str, argv: list[str]) -> bool:
+    """Check if a command only needs the docker CLI and can run against the local docker socket"""
+    if not (USE_LOCAL_SOCKET and host == LOCAL_HOST):
+        return False
+    
+    # Shell snippets qualify as long as they start with a docker command
+    if argv[:2] == ["sh", "-c"]:
+        return argv[2].startswith("docker ")
+    
+    return argv[0] == "docker"
+
+
+def ssh_argv(host: str, argv: list[str]) -> list[str]:
+    """Build the ssh client command line that runs argv on a remote host"""
+    return [*SSH_PREFIX, f"root@{host}", shlex.join(argv)]
+
+
+async def run_ssh_command(host: str, argv: list[str]) -> tuple[bytes, bytes, int]:
+    """Execute command via SSH on remote host, or locally via docker socket if it's the local host.
+    
+    Output is returned as raw bytes; callers decode only what they need as text.
+    """
     # Check if this is the local host and we should use docker socket
-    if USE_LOCAL_SOCKET and host == LOCAL_HOST and command.startswith("docker "):
+    if uses_local_socket(host, argv):
+        return await run_subprocess(argv)
+    
+    reconnect_if_due(host)
+    
+    # Prefer the persistent connection, dropping it if it has gone away or
+    # stopped answering
+    conn = CONNECTIONS.get(host)
+    if conn is not None:
         try:
-            result = subprocess.run(
-                ["bash", "-c", command],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = await conn.run(shlex.join(argv), encoding=None, timeout=30)
             return result.stdout, result.stderr, result.returncode
-        except subprocess.TimeoutExpired:
-            return "", "Command timed out", 1
+        except asyncssh.TimeoutError:
+            drop_connection(host, conn)
+            return b"", b"Command timed out", 1
+        except asyncssh.ChannelOpenError:
+            # The connection is fine but out of sessions - only this call falls back
+            pass
+        except (asyncssh.Error, OSError):
+            drop_connection(host, conn)
+    
+    # Fall back to the ssh client for hosts without a persistent connection
+    return await run_subprocess(ssh_argv(host, argv))
+
+
+async def stream_ssh_command(host: str, argv: list[str], hold_first_chunk: bool = True) -> AsyncIterator[bytes]:
+    """Stream the combined stdout and stderr of a command in chunks.
+    
+    By default the first chunk is held back until it is full or the command has
+    exited, so a command that fails with a short error message raises
+    RuntimeError before anything has been yielded. Long-running commands pass
+    hold_first_chunk=False to get output as soon as it arrives instead.
+    """
+    use_local = uses_local_socket(host, argv)
+    process = None
+    
+    if not use_local:
+        reconnect_if_due(host)
+    
+    conn = None if use_local else CONNECTIONS.get(host)
+    if conn is not None:
+        try:
+            process = await conn.create_process(shlex.join(argv), encoding=None, stderr=asyncssh.STDOUT)
+        except asyncssh.ChannelOpenError:
+            # The connection is fine but out of sessions - only this call falls back
+            pass
+        except (asyncssh.Error, OSError):
+            drop_connection(host, conn)
+    
+    if process is None:
+        cmd = argv if use_local else ssh_argv(host, argv)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True
+            )
         except Exception as e:
-            return "", str(e), 1
+            raise RuntimeError(str(e))
     
-    # Use SSH for remote hosts or if local socket is not available
-    cmd = ["ssh", "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=5", f"root@{host}", command]
+    try:
+        try:
+            if hold_first_chunk:
+                chunk = await process.stdout.readexactly(LOG_CHUNK_SIZE)
+            else:
+                chunk = await process.stdout.read(LOG_CHUNK_SIZE)
+        except asyncio.IncompleteReadError as e:
+            # The whole output fit in one chunk, so the command has finished
+            if isinstance(process, asyncssh.SSHClientProcess):
+                await process.wait_closed()
+                returncode = process.returncode
+            else:
+                returncode = await process.wait()
+            
+            if returncode != 0:
+                raise RuntimeError(e.partial.decode("utf-8", errors="replace"))
+            if e.partial:
+                yield e.partial
+            return
+        
+        while chunk:
+            yield chunk
+            chunk = await process.stdout.read(LOG_CHUNK_SIZE)
+    finally:
+        if isinstance(process, asyncssh.SSHClientProcess):
+            process.close()
+        elif process.returncode is None:
+            kill_process_group(process)
+            await process.wait()
+
+
+async def start_ssh_master(host: str) -> None:
+    """Open a background SSH master connection to a host for later commands to reuse"""
+    cmd = [*SSH_PREFIX, "-M", "-N", "-f", f"root@{host}"]
     
+    # The backgrounded master may keep inherited pipes open, so don't capture output
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
         )
-        return result.stdout, result.stderr, result.returncode
-    except subprocess.TimeoutExpired:
-        return "", "Command timed out", 1
-    except Exception as e:
-        return "", str(e), 1
+        await asyncio.wait_for(process.wait(), timeout=30)
+    except Exception:
+        # Not fatal - the first real command will open the master instead
+        pass
+
+
+def open_docker_client(host: str) -> Optional[docker.DockerClient]:
+    """Connect to a host's Docker Engine API, or return None if it isn't available"""
+    if USE_LOCAL_SOCKET and host == LOCAL_HOST:
+        base_url = "unix:///var/run/docker.sock"
+    else:
+        base_url = f"ssh://root@{host}"
+    
+    try:
+        return docker.DockerClient(base_url=base_url, use_ssh_client=True, timeout=30)
+    except Exception:
+        return None
+
+
+async def connect_host(host: str) -> None:
+    """Open persistent SSH and Docker Engine API connections to a host, skipping any already open.
+    
+    If the SSH connection fails the ssh client fallback is primed instead, and
+    hosts without a working API client keep using the docker CLI until a
+    later reconnect succeeds.
+    """
+    loop = asyncio.get_running_loop()
+    if host not in CONNECTIONS:
+        try:
+            CONNECTIONS[host] = await asyncssh.connect(
+                host,
+                username="root",
+                known_hosts=None,
+                connect_timeout=5,
+                keepalive_interval=SSH_KEEPALIVE_INTERVAL,
+                keepalive_count_max=SSH_KEEPALIVE_COUNT_MAX
+            )
+        except (asyncssh.Error, OSError):
+            await start_ssh_master(host)
+    
+    # Only try the API on hosts we could reach, so a down host can't stall startup
+    if host not in CLIENTS and (host in CONNECTIONS or (USE_LOCAL_SOCKET and host == LOCAL_HOST)):
+        client = await loop.run_in_executor(API_EXECUTOR, open_docker_client, host)
+        if client is not None:
+            CLIENTS[host] = client
+    
+    # Back off further each time the host still isn't fully connected
+    if host in CONNECTIONS and host in CLIENTS:
+        RECONNECT_DELAYS.pop(host, None)
+    else:
+        delay = RECONNECT_DELAYS.get(host)
+        RECONNECT_DELAYS[host] = RECONNECT_DELAY if delay is None else min(delay * 2, RECONNECT_MAX_DELAY)
+    RECONNECT_AT[host] = time.monotonic() + RECONNECT_DELAYS.get(host, RECONNECT_DELAY)
+
+
+def reconnect_if_due(host: str) -> None:
+    """Reopen a host's dropped SSH connection or API client in the background once its backoff has passed.
+    
+    The request that notices stays on the ssh client / docker CLI fallback
+    rather than waiting for the connection.
+    """
+    if host in CONNECTIONS and host in CLIENTS:
+        return
+    if host in RECONNECTS or time.monotonic() < RECONNECT_AT.get(host, 0):
+        return
+    
+    task = asyncio.create_task(connect_host(host))
+    RECONNECTS[host] = task
+    task.add_done_callback(lambda task: RECONNECTS.pop(host, None))
+
+
+def invalidate_host(host: str, names: Optional[set[str]] = None, container_id: str = "") -> None:
+    """Drop cached results for one container on a host (plus the host-wide ones), or for the whole host.
+    
+    The endpoints accept a container name, ID or ID prefix, so results cached
+    under any of them are dropped.
+    """
+    def matches(container_name: Optional[str]) -> bool:
+        if names is None:
+            return True
+        return container_name in names or bool(container_id and container_name and container_id.startswith(container_name))
+    
+    CACHE_GENERATIONS[host] = CACHE_GENERATIONS.get(host, 0) + 1
+    
+    for key in list(RESPONSE_CACHE.keys()):
+        if key[0] == host and (key[1] is None or matches(key[1])):
+            RESPONSE_CACHE.pop(key, None)
+    
+    for key in list(NOT_FOUND_CACHE.keys()):
+        if key[0] == host and matches(key[1]):
+            NOT_FOUND_CACHE.pop(key, None)
+
+
+async def watch_events(host: str) -> None:
+    """Follow docker events on a host and invalidate cached results as containers change.
+    
+    While the stream is up, results for the host are cached for EVENTS_CACHE_TTL.
+    If it drops, the host's results are flushed and it goes back to CACHE_TTL
+    until the stream is re-established.
+    """
+    while True:
+        # Replay from a while before subscribing so nothing falls in the gap,
+        # even if the Docker host's clock is behind ours. Replayed events only
+        # invalidate again, which is harmless.
+        argv = ["docker", "events", "--format", "{{json .}}", "--since", str(int(time.time()) - EVENTS_REPLAY_MARGIN),
+                "--filter", "type=container"]
+        for event in INVALIDATING_EVENTS:
+            argv += ["--filter", f"event={event}"]
+        
+        WATCHED_HOSTS.add(host)
+        try:
+            buffer = b""
+            async for chunk in stream_ssh_command(host, argv, hold_first_chunk=False):
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                for line in lines:
+                    try:
+                        event = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    
+                    actor = event.get("Actor") or {}
+                    attributes = actor.get("Attributes") or {}
+                    names = {name.lstrip("/") for name in (attributes.get("name"), attributes.get("oldName")) if name}
+                    invalidate_host(host, names, actor.get("ID") or "")
+        except Exception:
+            pass
+        finally:
+            WATCHED_HOSTS.discard(host)
+            invalidate_host(host)
+        
+        await asyncio.sleep(10)
+
+
+@app.on_event("startup")
+async def open_ssh_connections():
+    """Establish SSH connections to all hosts before the first request"""
+    await asyncio.gather(*[connect_host(host) for host in DOCKER_HOSTS])
+    
+    if WATCH_EVENTS:
+        for host in DOCKER_HOSTS:
+            EVENT_WATCHERS[host] = asyncio.create_task(watch_events(host))
+
+
+@app.on_event("shutdown")
+async def close_ssh_connections():
+    """Stop watching docker events and close the persistent SSH connections and Docker API clients"""
+    for task in EVENT_WATCHERS.values():
+        task.cancel()
+    await asyncio.gather(*EVENT_WATCHERS.values(), return_exceptions=True)
+    EVENT_WATCHERS.clear()
+    
+    for task in RECONNECTS.values():
+        task.cancel()
+    await asyncio.gather(*RECONNECTS.values(), return_exceptions=True)
+    
+    for client in CLIENTS.values():
+        client.close()
+    CLIENTS.clear()
+    
+    for conn in CONNECTIONS.values():
+        conn.close()
+    await asyncio.gather(*[conn.wait_closed() for conn in CONNECTIONS.values()])
+    CONNECTIONS.clear()
+
+
+def validate_host(host: str) -> None:
+    """Reject hosts that aren't configured before anything is run against them"""
+    if host not in VALID_HOSTS:
+        raise HTTPException(status_code=400, detail=f"Unknown host: {host}")
+
+
+def is_missing_container(stderr: bytes) -> bool:
+    """Check if a failed docker command's error output says the container doesn't exist"""
+    return any(error in stderr for error in MISSING_CONTAINER_ERRORS)
+
+
+def container_not_found(host: str, container_name: str, detail: str, missing: bool = True) -> HTTPException:
+    """Build a 404 for a failed container lookup.
+    
+    Only lookups where the container is known to be missing are remembered so
+    repeat lookups skip SSH - other failures may not happen again.
+    """
+    if missing:
+        NOT_FOUND_CACHE[(host, container_name)] = (404, detail)
+    return HTTPException(status_code=404, detail=detail)
+
+
+def check_not_found(host: str, container_name: str, nocache: bool = False) -> None:
+    """Re-raise a recently cached 404 for a container, unless nocache asks to look again"""
+    if nocache:
+        NOT_FOUND_CACHE.pop((host, container_name), None)
+        return
+    
+    cached = NOT_FOUND_CACHE.get((host, container_name))
+    if cached is not None:
+        status_code, detail = cached
+        raise HTTPException(status_code=status_code, detail=detail)
 
 
 @app.get("/")
-def read_root():
+async def read_root():
     """Health check endpoint"""
     return {
         "service": "Docker Container Inspector API",
@@ -92,177 +581,411 @@ def read_root():
     }
 
 
-@app.get("/api/containers", response_model=ContainerList)
-def list_containers():
-    """List all containers across all Docker hosts"""
-    all_containers = []
+async def api_list_containers(host: str) -> Optional[list[dict]]:
+    """List a host's containers through the Docker Engine API, shaped like docker ps output.
+    
+    Returns None if the host has no API client (or it has failed), so callers
+    can fall back to the docker CLI.
+    """
+    client = CLIENTS.get(host)
+    if client is None:
+        reconnect_if_due(host)
+        return None
+    
+    loop = asyncio.get_running_loop()
+    try:
+        containers = await loop.run_in_executor(API_EXECUTOR, functools.partial(client.api.containers, all=True))
+    except Exception:
+        CLIENTS.pop(host, None)
+        return None
+    
+    # The API returns every name with a leading slash, docker ps joins them with commas
+    for container in containers:
+        container["Names"] = ",".join(name.lstrip("/") for name in container.get("Names") or []) or "unknown"
+    return containers
+
+
+async def api_inspect(host: str, container_name: str) -> Optional[dict]:
+    """Inspect a container through the Docker Engine API.
+    
+    Returns None if the host has no API client (or it has failed), so callers
+    can fall back to the docker CLI.
+    """
+    client = CLIENTS.get(host)
+    if client is None:
+        reconnect_if_due(host)
+        return None
     
-    for host in DOCKER_HOSTS:
-        # Get container list in JSON format
-        command = 'docker ps -a --format "{{json .}}"'
-        stdout, stderr, returncode = run_ssh_command(host, command)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(API_EXECUTOR, client.api.inspect_container, container_name)
+    except docker.errors.NotFound as e:
+        raise container_not_found(host, container_name, f"Container not found: {e.explanation or e}")
+    except Exception:
+        CLIENTS.pop(host, None)
+        return None
+
+
+def discard_pending_fetch(task: asyncio.Task) -> None:
+    """Forget a finished background fetch, retrieving any error so it isn't logged as unhandled"""
+    PENDING_FETCHES.discard(task)
+    if not task.cancelled():
+        task.exception()
+
+
+async def fetch_host_containers(host: str) -> List[dict]:
+    """List the containers on a single Docker host"""
+    parsed = await api_list_containers(host)
+    
+    if parsed is None:
+        argv = ["docker", "ps", "-a", "--format", "{{json .}}"]
+        stdout, stderr, returncode = await run_ssh_command(host, argv)
         
         if returncode != 0:
-            continue
+            raise RuntimeError(f"Failed to list containers on {host}: {stderr.decode(errors='replace')}")
         
-        # Parse each line as JSON
-        for line in stdout.strip().split('\n'):
-            if not line:
-                continue
-            try:
-                container = json.loads(line)
-                all_containers.append(ContainerInfo(
-                    name=container.get('Names', 'unknown'),
-                    host=host,
-                    image=container.get('Image', 'unknown'),
-                    state=container.get('State', 'unknown'),
-                    status=container.get('Status', 'unknown')
-                ))
-            except json.JSONDecodeError:
-                continue
-    
-    return ContainerList(containers=all_containers)
-
-
-@app.get("/api/container/{container_name}/logs")
-def get_container_logs(
-    container_name: str,
+        # Each line is a JSON object - join them into one array and parse it in a
+        # single call, only falling back to line-by-line to skip malformed lines
+        lines = [line for line in stdout.strip().split(b'\n') if line]
+        try:
+            parsed = orjson.loads(b"[" + b",".join(lines) + b"]")
+        except orjson.JSONDecodeError:
+            parsed = []
+            for line in lines:
+                try:
+                    parsed.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue
+    
+    # docker ps output is trusted, so build plain ContainerInfo-shaped dicts
+    # rather than validating every field of every container
+    return [
+        {
+            "name": container.get('Names', 'unknown'),
+            "host": host,
+            "image": container.get('Image', 'unknown'),
+            "state": container.get('State', 'unknown'),
+            "status": container.get('Status', 'unknown')
+        }
+        for container in parsed
+    ]
+
+
+# ContainerList documents the response; the body is encoded directly, since a
+# response_model would validate every container again
+@app.get("/api/containers", responses={200: {"model": ContainerList}})
+async def list_containers(
+    nocache: bool = Query(False, description="Bypass the server-side cache")
+):
+    """List all containers across all Docker hosts.
+    
+    Hosts that fail or don't answer within HOST_TIMEOUT are left out and listed
+    in partial_hosts. Slow hosts keep running in the background, so their
+    result is cached for the next request.
+    """
+    all_containers = []
+    partial_hosts = []
+    
+    # Get container list from every host in parallel
+    tasks = {
+        host: asyncio.create_task(
+            cached_fetch((host, None, "containers"), lambda host=host: fetch_host_containers(host), nocache)
+        )
+        for host in DOCKER_HOSTS
+    }
+    await asyncio.wait(tasks.values(), timeout=HOST_TIMEOUT)
+    
+    for host, task in tasks.items():
+        if not task.done():
+            PENDING_FETCHES.add(task)
+            task.add_done_callback(discard_pending_fetch)
+            partial_hosts.append(host)
+        elif task.exception() is not None:
+            partial_hosts.append(host)
+        else:
+            all_containers.extend(task.result())
+    
+    # Don't let clients hold on to an incomplete listing
+    cache_control = "no-store" if partial_hosts else f"max-age={CACHE_TTL}"
+    return Response(
+        content=orjson.dumps({"containers": all_containers, "partial_hosts": partial_hosts}),
+        media_type="application/json",
+        headers={"Cache-Control": cache_control}
+    )
+
+
+@app.get("/api/container/{container_name}/logs", response_class=StreamingResponse)
+async def get_container_logs(
+    container_name: str = Path(..., description="Container name or ID", pattern=CONTAINER_NAME_PATTERN),
     host: str = Query(..., description="Docker host where container is running"),
-    tail: int = Query(500, description="Number of log lines to return", ge=1, le=10000),
-    since: Optional[str] = Query(None, description="Show logs since timestamp (e.g. 2023-01-01T00:00:00)")
+    tail: Optional[int] = Query(None, description="Number of log lines to return (default 500 unless since is set)", ge=1, le=10000),
+    since: Optional[str] = Query(None, description="Show logs since timestamp (e.g. 2023-01-01T00:00:00)"),
+    grep: Optional[str] = Query(None, description="Only return lines matching this extended regex (filtered on the Docker host)",
+                                pattern=r"^[\w.\-\s/:|]+$")
 ):
-    """Get logs from a specific container"""
-    command = f"docker logs --tail {tail}"
+    """Stream logs from a specific container as plain text"""
+    validate_host(host)
+    check_not_found(host, container_name)
+    
+    if tail is None and not since:
+        tail = 500
+    
+    argv = ["docker", "logs"]
+    if tail is not None:
+        argv += ["--tail", str(tail)]
     if since:
-        command += f" --since {since}"
-    command += f" {container_name}"
+        argv += ["--since", since]
+    argv.append(container_name)
+    
+    # Filter on the Docker host so only matching lines cross the network. The
+    # container is checked first because grep would swallow docker's error,
+    # and grep finding no matches (exit status 1) is not a failure.
+    if grep:
+        check = ["docker", "inspect", "--type", "container", "--format", "{{.Id}}", container_name]
+        script = (f"{shlex.join(check)} > /dev/null || exit; "
+                  f"{shlex.join(argv)} 2>&1 | grep -E -- {shlex.quote(grep)}; [ $? -le 1 ]")
+        argv = ["sh", "-c", script]
+    
+    # Docker logs go to both stdout and stderr, which are streamed together
+    chunks = stream_ssh_command(host, argv)
+    try:
+        first_chunk = await anext(chunks, b"")
+    except RuntimeError as e:
+        # Not cached - the error may just as well come from since or grep
+        raise HTTPException(status_code=404, detail=f"Container not found or error: {e}")
+    
+    async def stream_logs():
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+    
+    return StreamingResponse(stream_logs(), media_type="text/plain")
+
+
+async def fetch_all_inspects(host: str) -> dict[str, dict]:
+    """Inspect every container on a host in one SSH round-trip, keyed by container name"""
+    argv = ["sh", "-c", "docker inspect $(docker ps -aq)"]
+    
+    # docker inspect still prints the containers it found if one disappears
+    # between ps and inspect, so only give up when there is no output at all
+    stdout, stderr, returncode = await run_ssh_command(host, argv)
+    
+    if not stdout.strip():
+        return {}
+    
+    try:
+        inspect_data = orjson.loads(stdout)
+    except orjson.JSONDecodeError as e:
+        raise RuntimeError(f"Failed to parse inspect output from {host}: {str(e)}")
+    
+    return {data.get("Name", "").lstrip("/"): data for data in inspect_data}
+
+
+async def find_inspect(host: str, container_name: str, nocache: bool = False) -> Optional[dict]:
+    """Look a container up in its host's batched inspect results.
+    
+    Returns None when the batch has no entry for the container (or nocache is
+    set), in which case callers fall back to inspecting it on its own.
+    """
+    if nocache:
+        return None
+    
+    try:
+        inspects = await cached_fetch((host, None, "inspect-all"), lambda: fetch_all_inspects(host))
+    except RuntimeError:
+        return None
+    
+    return inspects.get(container_name)
+
+
+async def fetch_inspect(host: str, container_name: str, nocache: bool = False) -> bytes:
+    """Get full docker inspect output for a container, as an encoded JSON response body"""
+    envelope = b'{"container":' + orjson.dumps(container_name) + b',"host":' + orjson.dumps(host) + b',"inspect":'
+    
+    inspect = await find_inspect(host, container_name, nocache)
+    if inspect is None:
+        inspect = await api_inspect(host, container_name)
+    if inspect is not None:
+        return envelope + orjson.dumps(inspect) + b"}"
+    
+    argv = ["docker", "inspect", container_name]
     
-    stdout, stderr, returncode = run_ssh_command(host, command)
+    stdout, stderr, returncode = await run_ssh_command(host, argv)
     
     if returncode != 0:
-        raise HTTPException(status_code=404, detail=f"Container not found or error: {stderr}")
+        raise container_not_found(host, container_name, f"Container not found: {stderr.decode(errors='replace')}",
+                                  is_missing_container(stderr))
     
-    # Docker logs go to both stdout and stderr, combine them
-    logs = stdout + stderr
+    # docker inspect prints a one-element JSON array - splice the object
+    # straight into the response rather than decoding and re-encoding it
+    inspect_data = stdout.strip()
+    if not (inspect_data.startswith(b"[") and inspect_data.endswith(b"]")):
+        raise HTTPException(status_code=500, detail="Failed to parse inspect output: expected a JSON array")
     
-    return {
-        "container": container_name,
-        "host": host,
-        "lines": tail,
-        "logs": logs
-    }
+    return envelope + (inspect_data[1:-1].strip() or b"{}") + b"}"
 
 
 @app.get("/api/container/{container_name}/inspect")
-def inspect_container(
-    container_name: str,
-    host: str = Query(..., description="Docker host where container is running")
+async def inspect_container(
+    container_name: str = Path(..., description="Container name or ID", pattern=CONTAINER_NAME_PATTERN),
+    host: str = Query(..., description="Docker host where container is running"),
+    nocache: bool = Query(False, description="Bypass the server-side cache")
 ):
     """Get full docker inspect output for a container"""
-    command = f"docker inspect {container_name}"
+    validate_host(host)
+    check_not_found(host, container_name, nocache)
     
-    stdout, stderr, returncode = run_ssh_command(host, command)
+    # The cached body is already encoded, so send it as-is
+    body = await cached_fetch(
+        (host, container_name, "inspect"),
+        lambda: fetch_inspect(host, container_name, nocache),
+        nocache
+    )
+    return Response(content=body, media_type="application/json", headers={"Cache-Control": f"max-age={CACHE_TTL}"})
+
+
+async def fetch_compose_file(host: str, container_name: str, nocache: bool = False) -> dict:
+    """Get the docker-compose.yml file for a container"""
+    # Try to find the compose file by looking at container labels
+    inspect = await find_inspect(host, container_name, nocache)
+    if inspect is None:
+        inspect = await api_inspect(host, container_name)
+    if inspect is not None:
+        labels = (inspect.get("Config") or {}).get("Labels") or {}
+        compose_dir = labels.get("com.docker.compose.project.working_dir", "")
+        if not compose_dir:
+            raise HTTPException(status_code=404, detail="Could not find compose project directory")
+        
+        # Read the compose file
+        argv = ["cat", f"{compose_dir}/docker-compose.yml"]
+        stdout, stderr, returncode = await run_ssh_command(host, argv)
+        compose_content = stdout
+    else:
+        # Look up the directory and read the file in a single round-trip - the
+        # directory comes back on the first line, followed by the file
+        check = ["docker", "inspect", container_name, "--format",
+                 '{{index .Config.Labels "com.docker.compose.project.working_dir"}}']
+        script = (f'dir=$({shlex.join(check)}) && [ -n "$dir" ] || exit 1; '
+                  f'echo "$dir"; cat "$dir/docker-compose.yml"')
+        
+        stdout, stderr, returncode = await run_ssh_command(host, ["sh", "-c", script])
+        
+        compose_dir, _, compose_content = stdout.partition(b"\n")
+        if not compose_dir:
+            raise HTTPException(status_code=404, detail="Could not find compose project directory")
+        
+        compose_dir = compose_dir.decode(errors="replace")
     
     if returncode != 0:
-        raise HTTPException(status_code=404, detail=f"Container not found: {stderr}")
+        raise HTTPException(status_code=404, detail=f"Compose file not found: {stderr.decode(errors='replace')}")
     
-    try:
-        inspect_data = json.loads(stdout)
-        return {
-            "container": container_name,
-            "host": host,
-            "inspect": inspect_data[0] if inspect_data else {}
-        }
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse inspect output: {str(e)}")
+    return {
+        "container": container_name,
+        "host": host,
+        "compose_file_path": f"{compose_dir}/docker-compose.yml",
+        "compose_content": compose_content.decode(errors="replace")
+    }
 
 
 @app.get("/api/container/{container_name}/compose")
-def get_compose_file(
-    container_name: str,
-    host: str = Query(..., description="Docker host where container is running")
+async def get_compose_file(
+    response: Response,
+    container_name: str = Path(..., description="Container name or ID", pattern=CONTAINER_NAME_PATTERN),
+    host: str = Query(..., description="Docker host where container is running"),
+    nocache: bool = Query(False, description="Bypass the server-side cache")
 ):
     """Get the docker-compose.yml file for a container"""
-    # Try to find the compose file by looking at container labels
-    command = f"docker inspect {container_name} --format '{{{{index .Config.Labels \"com.docker.compose.project.working_dir\"}}}}'"
-    
-    stdout, stderr, returncode = run_ssh_command(host, command)
+    validate_host(host)
+    check_not_found(host, container_name, nocache)
     
-    if returncode != 0 or not stdout.strip():
-        raise HTTPException(status_code=404, detail="Could not find compose project directory")
-    
-    compose_dir = stdout.strip()
-    
-    # Read the compose file
-    command = f"cat {compose_dir}/docker-compose.yml"
-    stdout, stderr, returncode = run_ssh_command(host, command)
+    result = await cached_fetch(
+        (host, container_name, "compose"),
+        lambda: fetch_compose_file(host, container_name, nocache),
+        nocache
+    )
+    response.headers["Cache-Control"] = f"max-age={CACHE_TTL}"
+    return result
+
+
+async def fetch_env(host: str, container_name: str, nocache: bool = False) -> dict:
+    """Get environment variables for a container"""
+    inspect = await find_inspect(host, container_name, nocache)
+    if inspect is None:
+        inspect = await api_inspect(host, container_name)
+    if inspect is not None:
+        env_list = (inspect.get("Config") or {}).get("Env") or []
+    else:
+        argv = ["docker", "inspect", container_name, "--format", "{{json .Config.Env}}"]
+        
+        stdout, stderr, returncode = await run_ssh_command(host, argv)
+        
+        if returncode != 0:
+            raise container_not_found(host, container_name, f"Container not found: {stderr.decode(errors='replace')}",
+                                      is_missing_container(stderr))
+        
+        try:
+            env_list = orjson.loads(stdout) or []
+        except orjson.JSONDecodeError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to parse environment: {str(e)}")
     
-    if returncode != 0:
-        raise HTTPException(status_code=404, detail=f"Compose file not found: {stderr}")
+    # Convert list of "KEY=VALUE" to dict, skipping entries without an "=" (KEY= keeps an empty value)
+    env_dict = {key: value for key, sep, value in (env_var.partition('=') for env_var in env_list) if sep}
     
     return {
         "container": container_name,
         "host": host,
-        "compose_file_path": f"{compose_dir}/docker-compose.yml",
-        "compose_content": stdout
+        "environment": env_dict
     }
 
 
 @app.get("/api/container/{container_name}/env")
-def get_container_env(
-    container_name: str,
-    host: str = Query(..., description="Docker host where container is running")
+async def get_container_env(
+    response: Response,
+    container_name: str = Path(..., description="Container name or ID", pattern=CONTAINER_NAME_PATTERN),
+    host: str = Query(..., description="Docker host where container is running"),
+    nocache: bool = Query(False, description="Bypass the server-side cache")
 ):
     """Get environment variables for a container"""
-    command = f"docker inspect {container_name} --format '{{{{json .Config.Env}}}}'"
-    
-    stdout, stderr, returncode = run_ssh_command(host, command)
-    
-    if returncode != 0:
-        raise HTTPException(status_code=404, detail=f"Container not found: {stderr}")
+    validate_host(host)
+    check_not_found(host, container_name, nocache)
     
-    try:
-        env_list = json.loads(stdout)
-        # Convert list of "KEY=VALUE" to dict
-        env_dict = {}
-        for env_var in env_list:
-            if '=' in env_var:
-                key, value = env_var.split('=', 1)
-                env_dict[key] = value
-        
-        return {
-            "container": container_name,
-            "host": host,
-            "environment": env_dict
-        }
-    except json.JSONDecodeError as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse environment: {str(e)}")
+    result = await cached_fetch(
+        (host, container_name, "env"),
+        lambda: fetch_env(host, container_name, nocache),
+        nocache
+    )
+    response.headers["Cache-Control"] = f"max-age={CACHE_TTL}"
+    return result
 
 
 @app.get("/api/container/{container_name}/stats")
-def get_container_stats(
-    container_name: str,
+async def get_container_stats(
+    container_name: str = Path(..., description="Container name or ID", pattern=CONTAINER_NAME_PATTERN),
     host: str = Query(..., description="Docker host where container is running")
 ):
     """Get real-time container stats (single snapshot)"""
-    command = f"docker stats {container_name} --no-stream --format '{{{{json .}}}}'"
+    validate_host(host)
+    check_not_found(host, container_name)
+    
+    argv = ["docker", "stats", container_name, "--no-stream", "--format", "{{json .}}"]
     
-    stdout, stderr, returncode = run_ssh_command(host, command)
+    stdout, stderr, returncode = await run_ssh_command(host, argv)
     
     if returncode != 0:
-        raise HTTPException(status_code=404, detail=f"Container not found: {stderr}")
+        raise container_not_found(host, container_name, f"Container not found: {stderr.decode(errors='replace')}",
+                                  is_missing_container(stderr))
     
     try:
-        stats = json.loads(stdout)
+        stats = orjson.loads(stdout)
         return {
             "container": container_name,
             "host": host,
             "stats": stats
         }
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse stats: {str(e)}")
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")